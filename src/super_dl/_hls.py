@@ -0,0 +1,215 @@
+"""Native HLS downloader used by the m3u8-based site modules.
+
+`ffmpeg -c copy` fetches the segments of a playlist one after another, paying a
+full round trip per segment. Since no transcoding is involved, this module
+fetches the segments itself with bounded concurrency into per-segment temporary
+files, then concatenates them in playlist order (in-kernel with `os.sendfile` on
+Linux). MPEG-TS output is remuxed into an mp4 container with a
+local `ffmpeg -c copy` pass when ffmpeg is available; without it the stream is
+saved under a `.ts` name instead.
+
+Encrypted or byte-range playlists raise `UnsupportedPlaylist`; callers fall back
+to ffmpeg for those.
+"""
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Mapping, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+
+from . import _http
+
+DEFAULT_WORKERS = 12
+# playlists this short are fetched inline; a thread pool only adds overhead
+SERIAL_MAX_SEGMENTS = 2
+
+_FFMPEG = shutil.which("ffmpeg")
+
+# file-to-file sendfile() is Linux-only; other platforms copy through userspace
+_USE_SENDFILE = sys.platform.startswith("linux")
+
+_BANDWIDTH_RE = re.compile(r"[:,]BANDWIDTH=(\d+)")
+_KEY_METHOD_RE = re.compile(r"METHOD=([A-Z0-9-]+)")
+_URI_ATTR_RE = re.compile(r'URI="([^"]+)"')
+_AUDIO_ATTR_RE = re.compile(r'[:,]AUDIO="([^"]+)"')
+_GROUP_ID_ATTR_RE = re.compile(r'[:,]GROUP-ID="([^"]+)"')
+
+
+class UnsupportedPlaylist(RuntimeError):
+    """Raised when a playlist uses features the native downloader does not handle."""
+
+
+def select_variant(playlist: str, base_url: str) -> Optional[str]:
+    """Return the highest-bandwidth variant URL of a master playlist, or None.
+
+    Raises `UnsupportedPlaylist` when that variant takes its audio from a
+    separate `#EXT-X-MEDIA` rendition, which the segment downloader cannot mux.
+    """
+    best: Optional[Tuple[int, str, Optional[str]]] = None
+    lines = playlist.splitlines()
+    for i, line in enumerate(lines):
+        if not line.startswith("#EXT-X-STREAM-INF"):
+            continue
+        m = _BANDWIDTH_RE.search(line)
+        bandwidth = int(m.group(1)) if m else 0
+        uri = next((l.strip() for l in lines[i + 1:] if l.strip() and not l.startswith("#")), None)
+        if uri and (best is None or bandwidth > best[0]):
+            audio = _AUDIO_ATTR_RE.search(line)
+            best = (bandwidth, urljoin(base_url, uri), audio.group(1) if audio else None)
+    if best is None:
+        return None
+
+    audio_group = best[2]
+    if audio_group:
+        for line in lines:
+            if not line.startswith("#EXT-X-MEDIA") or "TYPE=AUDIO" not in line:
+                continue
+            group = _GROUP_ID_ATTR_RE.search(line)
+            if group and group.group(1) == audio_group and _URI_ATTR_RE.search(line):
+                raise UnsupportedPlaylist(f"separate audio rendition ({audio_group})")
+    return best[1]
+
+
+def parse_media_playlist(playlist: str, base_url: str) -> Tuple[List[str], bool]:
+    """Return (segment URLs, is_fmp4) for a media playlist.
+
+    For fragmented-mp4 playlists the `#EXT-X-MAP` initialization section is the
+    first entry of the returned list.
+    """
+    segments: List[str] = []
+    is_fmp4 = False
+    for raw in playlist.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith("#EXT-X-KEY"):
+            m = _KEY_METHOD_RE.search(line)
+            if m and m.group(1) != "NONE":
+                raise UnsupportedPlaylist(f"encrypted segments ({m.group(1)})")
+        elif line.startswith("#EXT-X-BYTERANGE"):
+            raise UnsupportedPlaylist("byte-range segments")
+        elif line.startswith("#EXT-X-MAP"):
+            if "BYTERANGE=" in line:
+                raise UnsupportedPlaylist("byte-range initialization section")
+            m = _URI_ATTR_RE.search(line)
+            if m and not is_fmp4:
+                segments.append(urljoin(base_url, m.group(1)))
+                is_fmp4 = True
+        elif not line.startswith("#"):
+            segments.append(urljoin(base_url, line))
+    return segments, is_fmp4
+
+
+def _fetch(session: requests.Session, url: str, headers: Optional[Mapping[str, str]], timeout: float) -> requests.Response:
+    resp = session.get(url, headers=headers, timeout=timeout)
+    resp.raise_for_status()
+    return resp
+
+
+def _concat(paths: List[str], out_path: str) -> None:
+    """Concatenate the files in paths into out_path."""
+    with open(out_path, "wb") as out:
+        for path in paths:
+            with open(path, "rb") as seg:
+                if _USE_SENDFILE:
+                    size = os.fstat(seg.fileno()).st_size
+                    offset = 0
+                    while offset < size:
+                        offset += os.sendfile(out.fileno(), seg.fileno(), offset, size - offset)
+                else:
+                    shutil.copyfileobj(seg, out, _http.CHUNK_SIZE)
+
+
+def _remux(src: str, dst: str) -> bool:
+    """Remux an MPEG-TS file into dst with a local ffmpeg pass. Returns False if ffmpeg is missing."""
+    if not _FFMPEG:
+        return False
+    cmd = [_FFMPEG, "-y", "-hide_banner", "-loglevel", "error", "-i", src, "-c", "copy", dst]
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg remux failed: {proc.stderr.decode('utf8', errors='replace')}")
+    return True
+
+
+def download_hls(
+    m3u8_url: str,
+    out_path: str,
+    headers: Optional[Mapping[str, str]] = None,
+    session: Optional[requests.Session] = None,
+    max_workers: int = DEFAULT_WORKERS,
+    timeout: float = 30,
+) -> int:
+    """Download an HLS stream to out_path by fetching its segments concurrently.
+
+    Returns 0 on success; HTTP errors propagate as `requests` exceptions.
+    """
+    own_session = session is None
+    if own_session:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    try:
+        playlist_url = m3u8_url
+        playlist = _fetch(session, playlist_url, headers, timeout).text
+        variant = select_variant(playlist, playlist_url)
+        if variant:
+            playlist_url = variant
+            playlist = _fetch(session, playlist_url, headers, timeout).text
+
+        segments, is_fmp4 = parse_media_playlist(playlist, playlist_url)
+        if not segments:
+            raise RuntimeError("playlist contains no segments")
+
+        out_dir = os.path.dirname(out_path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+        # segments land in a scratch dir next to the output, so memory stays
+        # bounded and the final concatenation never leaves the filesystem
+        with tempfile.TemporaryDirectory(prefix=".super-dl-", dir=out_dir or ".") as tmp_dir:
+            seg_paths = [os.path.join(tmp_dir, f"{i:06d}") for i in range(len(segments))]
+
+            def fetch_segment(i: int) -> None:
+                _http.stream_to_file(session, segments[i], seg_paths[i], headers=headers, timeout=timeout)
+
+            if len(segments) <= SERIAL_MAX_SEGMENTS:
+                for i in range(len(segments)):
+                    fetch_segment(i)
+            else:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(segments))) as pool:
+                    futures = [pool.submit(fetch_segment, i) for i in range(len(segments))]
+                    try:
+                        for future in futures:
+                            future.result()
+                    except BaseException:
+                        # a failed segment (or Ctrl-C) aborts the download; skip the rest
+                        pool.shutdown(wait=True, cancel_futures=True)
+                        raise
+
+            joined = os.path.join(tmp_dir, "joined")
+            _concat(seg_paths, joined)
+            if is_fmp4 or out_path.lower().endswith(".ts"):
+                os.replace(joined, out_path)
+            elif not _remux(joined, out_path):
+                # without ffmpeg the stream stays MPEG-TS; name it for what it is
+                ts_path = os.path.splitext(out_path)[0] + ".ts"
+                os.replace(joined, ts_path)
+                print(
+                    f"ffmpeg not found; saved the MPEG-TS stream as {ts_path} instead of remuxing to {out_path}",
+                    file=sys.stderr,
+                )
+    finally:
+        if own_session:
+            session.close()
+
+    return 0
@@ -0,0 +1,30 @@
+"""Attribute-matching regex pieces shared by the regex-based extractors.
+
+HTML5 allows attribute values to be double-quoted, single-quoted or unquoted
+(minified pages often drop the quotes), and the extractors have to accept all
+three forms to find what an HTML parser would.
+"""
+from __future__ import annotations
+
+import re
+from typing import Match
+
+# an attribute value in one of three capture groups: "...", '...' or unquoted;
+# like html.parser, an unquoted value runs up to whitespace or '>'
+ATTR_VALUE = r"""(?:"([^"]*)"|'([^']*)'|([^\s"'>][^\s>]*))"""
+
+
+def attr(name: str) -> str:
+    """Return regex source matching ` name=value`; read the value with `value`."""
+    return r"\s" + name + r"\s*=\s*" + ATTR_VALUE
+
+
+def attr_equals(name: str, val: str) -> str:
+    """Return regex source matching ` name=val` with val quoted or unquoted."""
+    v = re.escape(val)
+    return r"\s" + name + r"""\s*=\s*(?:"%s"|'%s'|%s(?=[\s>]))""" % (v, v, v)
+
+
+def value(m: Match[str], group: int = 1) -> str:
+    """Return the value captured by an `attr` pattern whose groups start at group."""
+    return next(v for v in m.group(group, group + 1, group + 2) if v is not None)
@@ -0,0 +1,95 @@
+"""Shared HTTP helpers for the site modules.
+
+Each site module keeps one module-level `requests.Session` (created with
+`new_session`) so the page fetch and the following media download reuse the
+same pooled keep-alive connections instead of paying a new TCP+TLS handshake,
+or a curl/wget fork, per request.
+"""
+from __future__ import annotations
+
+import shutil
+import socket
+from typing import Mapping, Optional
+
+import requests
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+CHUNK_SIZE = 1 << 20
+POOL_MAXSIZE = 16
+
+# transient gateway errors are retried with a short backoff; the last response
+# is still returned, so raise_for_status() reports it as before
+_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504), raise_on_status=False)
+
+# urllib3's defaults already disable Nagle (TCP_NODELAY); keep-alive probes let
+# pooled connections idling between page fetch and download notice dead peers.
+# SO_RCVBUF is left alone: setting it turns off the kernel's window autotuning
+_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+
+class _TunedAdapter(requests.adapters.HTTPAdapter):
+    """HTTPAdapter whose connections are opened with _SOCKET_OPTIONS."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", _SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs.setdefault("socket_options", _SOCKET_OPTIONS)
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+
+def new_session(user_agent: str) -> requests.Session:
+    """Return a session that sends user_agent on every request.
+
+    The connection pool is sized for the concurrent segment and range fetches,
+    idempotent requests are retried on 502/503/504 responses and connections
+    use TCP keep-alive.
+    """
+    session = requests.Session()
+    session.headers.update({"User-Agent": user_agent})
+    adapter = _TunedAdapter(pool_maxsize=POOL_MAXSIZE, max_retries=_RETRY)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def prewarm(session: requests.Session, url: str, timeout: float = 5) -> None:
+    """Open a pooled connection to url's host with a HEAD request, ignoring failures."""
+    try:
+        session.head(url, timeout=timeout).close()
+    except requests.RequestException:
+        pass
+
+
+def page_text(resp: requests.Response) -> str:
+    """Return the decoded body of resp.
+
+    Without a charset in Content-Type, requests falls back to ISO-8859-1 for
+    text/* types (mangling UTF-8 pages) and runs charset detection over the whole
+    body for anything else. Decode such bodies as UTF-8 directly instead; the
+    extractors only match ASCII patterns, so stray bytes are simply replaced.
+    """
+    if "charset=" in resp.headers.get("Content-Type", "").lower():
+        return resp.text
+    return resp.content.decode("utf-8", errors="replace")
+
+
+def stream_to_file(
+    session: requests.Session,
+    url: str,
+    out_path: str,
+    headers: Optional[Mapping[str, str]] = None,
+    timeout: float = 60,
+) -> None:
+    """Stream the body of a GET for url into out_path.
+
+    Raises `requests.HTTPError` for non-2xx responses.
+    """
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as r:
+        r.raise_for_status()
+        # let urllib3 undo any Content-Encoding while copying raw reads
+        r.raw.decode_content = True
+        with open(out_path, "wb") as fh:
+            shutil.copyfileobj(r.raw, fh, length=CHUNK_SIZE)
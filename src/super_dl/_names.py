@@ -0,0 +1,30 @@
+"""Filename helpers shared by the site modules."""
+from __future__ import annotations
+
+import re
+
+_SANITIZE_RE = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def sanitize(name: str) -> str:
+    """Replace every character outside [A-Za-z0-9._-] with '-'."""
+    return _SANITIZE_RE.sub("-", name)
+
+
+def url_basename(url: str) -> str:
+    """Return the last non-empty path segment of url, ignoring query and fragment.
+
+    Returns an empty string when the URL has no path segment. Splits with plain
+    string scans rather than a full URL parse; the result matches the path
+    component of `_url.parse`.
+    """
+    path = url.partition("#")[0].partition("?")[0]
+    # skip an optional scheme ("name:" with no slash before the colon) and an
+    # optional "//authority", neither of which holds path segments
+    colon = path.find(":")
+    start = colon + 1 if colon > 0 and path.find("/", 0, colon) < 0 else 0
+    if path.startswith("//", start):
+        start = path.find("/", start + 2)
+        if start < 0:
+            return ""
+    return path[start:].rstrip("/").rpartition("/")[2]
@@ -0,0 +1,25 @@
+"""Lightweight, memoized URL splitting shared by the CLI and site modules.
+
+`parse` uses the generic-syntax regular expression from RFC 3986 appendix B
+instead of `urllib.parse.urlparse`, and caches results because the same URL
+is typically dissected several times per download (site inference, filename
+derivation, ...).
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Tuple
+
+_URI_RE = re.compile(r"^(([^:/?#]+):)?(//([^/?#]*))?([^?#]*)(\?([^#]*))?(#(.*))?")
+
+
+@lru_cache(maxsize=1024)
+def parse(url: str) -> Tuple[str, str, str, str, str]:
+    """Split url into (scheme, netloc, path, query, fragment).
+
+    Missing components are returned as empty strings, like `urlparse`.
+    """
+    m = _URI_RE.match(url)
+    scheme, netloc, path, query, fragment = m.group(2, 4, 5, 7, 9)
+    return (scheme or "", netloc or "", path, query or "", fragment or "")
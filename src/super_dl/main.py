@@ -2,162 +2,291 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import inspect
 import sys
-from typing import Dict, Optional
-
-from . import __version__
-
-
-def _site_registry() -> Dict[str, str]:
-    """Return a mapping of supported site keys to module paths."""
-    # Each entry maps a site key to its module path and a list of hostname patterns
-    return {
-        "influencersgonewild": {
-            "module": "super_dl.sites.influencersgonewild",
-            "hosts": ["influencersgonewild.com"],
-        },
-        "eroleaked": {
-            "module": "super_dl.sites.eroleaked",
-            "hosts": ["eroleaked.com"],
-        },
-        "amateurdoporn": {
-            "module": "super_dl.sites.amateurdoporn",
-            "hosts": ["amateurdoporn.com"],
-        },
-        "cumslutx": {
-            "module": "super_dl.sites.cumslutx",
-            "hosts": ["cumslutx.com", "girlxnude.com", "fapplay.com"],
-        },
-            "simpthots": {
-                "module": "super_dl.sites.simpthots",
-                "hosts": ["simpthots.com"],
-            },
-            "thothub": {
-                "module": "super_dl.sites.thothub",
-                "hosts": ["thothub.to", "thothub.org"],
-            },
-            "thotfans": {
-                "module": "super_dl.sites.thotfans",
-                "hosts": ["thotfans.com"],
-            },
-            "fapnut": {
-                "module": "super_dl.sites.fapnut",
-                "hosts": ["fapnut.net"],
-            },
-    }
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from . import __version__, _http, _names, _url
+
+
+# Each entry maps a site key to its module path and a list of hostname patterns
+_REGISTRY: Dict[str, dict] = {
+    "influencersgonewild": {
+        "module": "super_dl.sites.influencersgonewild",
+        "hosts": ["influencersgonewild.com"],
+    },
+    "eroleaked": {
+        "module": "super_dl.sites.eroleaked",
+        "hosts": ["eroleaked.com"],
+    },
+    "amateurdoporn": {
+        "module": "super_dl.sites.amateurdoporn",
+        "hosts": ["amateurdoporn.com"],
+    },
+    "cumslutx": {
+        "module": "super_dl.sites.cumslutx",
+        "hosts": ["cumslutx.com", "girlxnude.com", "fapplay.com"],
+    },
+    "simpthots": {
+        "module": "super_dl.sites.simpthots",
+        "hosts": ["simpthots.com"],
+    },
+    "thothub": {
+        "module": "super_dl.sites.thothub",
+        "hosts": ["thothub.to", "thothub.org"],
+    },
+    "thotfans": {
+        "module": "super_dl.sites.thotfans",
+        "hosts": ["thotfans.com"],
+    },
+    "fapnut": {
+        "module": "super_dl.sites.fapnut",
+        "hosts": ["fapnut.net"],
+    },
+}
+
+# Flat hostname -> site key index so lookups are a few dict probes per URL
+_HOST_INDEX: Dict[str, str] = {
+    host: key for key, info in _REGISTRY.items() for host in info["hosts"]
+}
+
+# connection warm-ups run on their own small pool, beside the download workers
+_PREWARM_WORKERS = 4
 
 
 def infer_site_from_url(url: str) -> Optional[str]:
     """Infer site key from the given URL by matching hostname patterns.
 
     Returns the site key (e.g. 'influencersgonewild') or None if not recognized.
+    Subdomains of a registered host (e.g. 'cdn.thothub.to') resolve to the same site.
     """
-    from urllib.parse import urlparse
-
     if not url:
         return None
-    parsed = urlparse(url)
-    netloc = (parsed.netloc or "").lower()
-    # strip possible credentials
+    netloc = _url.parse(url)[1].lower()
+    # strip possible credentials and port
     if "@" in netloc:
         netloc = netloc.split("@", 1)[-1]
-    # strip leading www.
-    if netloc.startswith("www."):
-        netloc = netloc[4:]
-
-    registry = _site_registry()
-    for key, info in registry.items():
-        hosts = info.get("hosts", []) if isinstance(info, dict) else []
-        for host in hosts:
-            if host and host in netloc:
-                return key
+    netloc = netloc.split(":", 1)[0]
+
+    # walk the hostname labels from the left, trying each registrable suffix
+    parts = netloc.split(".")
+    for i in range(len(parts) - 1):
+        key = _HOST_INDEX.get(".".join(parts[i:]))
+        if key:
+            return key
     return None
 
 
-def main(argv=None) -> int:
-    parser = argparse.ArgumentParser(prog="super-dl", description="super-dl CLI")
-    parser.add_argument("--version", action="store_true", help="show version and exit")
-    parser.add_argument("--site", help="site key (e.g. influencersgonewild)")
-    parser.add_argument("url", nargs="?", help="URL of the page to download from")
-    parser.add_argument("--output", "-o", help="output file path (optional)")
+@functools.cache
+def _load_site(module_path: str):
+    """Import and return the site module at module_path (cached per process)."""
+    return __import__(module_path, fromlist=["*"])
 
-    args = parser.parse_args(argv)
 
-    if args.version:
-        print(__version__)
-        return 0
+@functools.cache
+def _accepts(func, param: str) -> bool:
+    """Return True if the site download callable takes a param argument."""
+    return param in inspect.signature(func).parameters
+
+
+def _batch_out_paths(urls: List[str]) -> List[str]:
+    """Name each batch download after its page URL, suffixing repeats with -2, -3, ...
+
+    Site defaults often name files after the media URL (e.g. every HLS page's
+    'index.m3u8'), so concurrent jobs could otherwise write the same file.
+    """
+    used = set()
+    paths = []
+    for url in urls:
+        base = _names.sanitize(_names.url_basename(url) or "video")
+        if base.lower().endswith(".mp4"):
+            base = base[:-4]
+        name, n = f"{base}.mp4", 2
+        while name in used:
+            name, n = f"{base}-{n}.mp4", n + 1
+        used.add(name)
+        paths.append(name)
+    return paths
+
+
+def _read_url_list(path: str) -> List[str]:
+    """Read URLs from path ('-' for stdin), one per line; blank lines and '#' comments are skipped."""
+    fh = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        lines = [line.strip() for line in fh]
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+    return [line for line in lines if line and not line.startswith("#")]
 
-    if not args.url:
-        parser.print_help()
-        return 1
 
-    registry = _site_registry()
+def _prewarm_hosts(pool: ThreadPoolExecutor, urls: List[str], site: Optional[str]) -> None:
+    """Queue one HEAD per unique (site, host) on pool so batch downloads find warm connections."""
+    seen = set()
+    for url in urls:
+        info = _REGISTRY.get(site or infer_site_from_url(url) or "")
+        scheme, netloc = _url.parse(url)[:2]
+        if not info or not netloc or (info["module"], netloc) in seen:
+            continue
+        seen.add((info["module"], netloc))
+        try:
+            session = getattr(_load_site(info["module"]), "_SESSION", None)
+        except Exception:  # pragma: no cover - reported again by _download_url
+            continue
+        if session is not None:
+            try:
+                pool.submit(_http.prewarm, session, f"{scheme or 'https'}://{netloc}/")
+            except RuntimeError:
+                # the batch already finished and the pool was shut down
+                return
 
+
+def _download_url(url: str, site: Optional[str], out_path: Optional[str], use_ffmpeg: bool) -> int:
+    """Resolve the site module for url and run its download flow. Returns a CLI exit code."""
     # Determine site key: prefer explicit --site, otherwise infer from URL
-    site_key = args.site
+    site_key = site
     if not site_key:
-        site_key = infer_site_from_url(args.url)
+        site_key = infer_site_from_url(url)
         if site_key:
             print(f"Inferred site: {site_key}")
 
     if not site_key:
-        print("Could not determine site for the provided URL. Provide --site.", file=sys.stderr)
+        print(f"Could not determine site for {url}. Provide --site.", file=sys.stderr)
         return 2
 
-    info = registry.get(site_key)
+    info = _REGISTRY.get(site_key)
     module_path = info["module"] if isinstance(info, dict) else info
     if not module_path:
-        print(f"Unknown site: {args.site}", file=sys.stderr)
+        print(f"Unknown site: {site}", file=sys.stderr)
         return 2
 
     # dynamic import of the site module
     try:
-        module = __import__(module_path, fromlist=["*"])
+        module = _load_site(module_path)
     except Exception as exc:  # pragma: no cover - CLI runtime error
-        print(f"Failed to import module for site {args.site}: {exc}", file=sys.stderr)
+        print(f"Failed to import module for site {site_key}: {exc}", file=sys.stderr)
         return 3
 
+    # Only HLS site modules take use_ffmpeg (and fapnut page_url); pass them
+    # only to callables that accept them, so mp4 sites ignore the flag
+    def dl_kwargs(func) -> dict:
+        kwargs = {"use_ffmpeg": True} if use_ffmpeg and _accepts(func, "use_ffmpeg") else {}
+        if _accepts(func, "page_url"):
+            kwargs["page_url"] = url
+        return kwargs
+
     # Module interface handling: prefer a high-level `full_download_from_page` if present.
     try:
         # 1) high-level helper (eroleaked implements this)
         if hasattr(module, "full_download_from_page"):
-            return module.full_download_from_page(args.url, out_path=args.output)
+            return module.full_download_from_page(url, out_path=out_path, **dl_kwargs(module.full_download_from_page))
 
         # 2) classic mp4 extraction flow: fetch_page -> extract_mp4_url -> download
         if all(hasattr(module, name) for name in ("fetch_page", "extract_mp4_url", "download")):
-            html = module.fetch_page(args.url)
+            html = module.fetch_page(url)
             mp4_url = module.extract_mp4_url(html)
             if not mp4_url:
-                print("No mp4 URL found on the page", file=sys.stderr)
+                print(f"No mp4 URL found on the page: {url}", file=sys.stderr)
                 return 4
-            return module.download(mp4_url, out_path=args.output)
+            return module.download(mp4_url, out_path=out_path)
 
         # 3) iframe -> m3u8 flow: fetch_page -> extract_iframe_src -> fetch iframe -> extract_m3u8_from_html -> download
         if all(hasattr(module, name) for name in ("fetch_page", "extract_iframe_src", "extract_m3u8_from_html", "download")):
-            page_html = module.fetch_page(args.url)
+            page_html = module.fetch_page(url)
             iframe_src = module.extract_iframe_src(page_html)
             if not iframe_src:
-                print("No iframe found on page", file=sys.stderr)
+                print(f"No iframe found on page: {url}", file=sys.stderr)
                 return 4
 
             # Resolve relative iframe URLs
             from urllib.parse import urljoin
 
-            iframe_src = urljoin(args.url, iframe_src)
+            iframe_src = urljoin(url, iframe_src)
 
             iframe_html = module.fetch_page(iframe_src)
             m3u8 = module.extract_m3u8_from_html(iframe_html)
             if not m3u8:
-                print("No .m3u8 file found on the page.", file=sys.stderr)
+                print(f"No .m3u8 file found on the page: {url}", file=sys.stderr)
                 return 4
-            return module.download(m3u8, out_path=args.output)
+            return module.download(m3u8, out_path=out_path, **dl_kwargs(module.download))
 
         print("Site module does not expose a supported interface", file=sys.stderr)
         return 5
     except Exception as exc:  # pragma: no cover - runtime
-        print(f"Error while processing: {exc}", file=sys.stderr)
+        print(f"Error while processing {url}: {exc}", file=sys.stderr)
         return 5
 
 
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="super-dl", description="super-dl CLI")
+    parser.add_argument("--version", action="store_true", help="show version and exit")
+    parser.add_argument("--site", help="site key (e.g. influencersgonewild)")
+    parser.add_argument("urls", nargs="*", metavar="url", help="URL(s) of the page(s) to download from")
+    parser.add_argument(
+        "--urls-from",
+        metavar="FILE",
+        help="read additional URLs from FILE, one per line ('-' for stdin)",
+    )
+    parser.add_argument("--output", "-o", help="output file path (optional, single URL only)")
+    parser.add_argument(
+        "--use-ffmpeg",
+        action="store_true",
+        help="download HLS (.m3u8) streams with ffmpeg instead of the native segment downloader",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=4,
+        help="number of URLs to process concurrently (default: 4)",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.version:
+        print(__version__)
+        return 0
+
+    if args.urls_from:
+        try:
+            args.urls += _read_url_list(args.urls_from)
+        except OSError as exc:
+            print(f"Could not read URL list: {exc}", file=sys.stderr)
+            return 2
+
+    if not args.urls:
+        parser.print_help()
+        return 1
+
+    if args.output and len(args.urls) > 1:
+        print("--output can only be used with a single URL", file=sys.stderr)
+        return 2
+
+    if len(args.urls) == 1:
+        return _download_url(args.urls[0], args.site, args.output, args.use_ffmpeg)
+
+    # Several URLs: repeated pages are fetched once, and every download gets its
+    # own page-derived output path so concurrent jobs never share a file
+    urls = list(dict.fromkeys(args.urls))
+    out_paths = _batch_out_paths(urls)
+
+    # Overlap their page fetches and downloads on a bounded pool.
+    # Host resolution and connection warm-ups run on a separate pool so they
+    # proceed alongside the first downloads instead of taking worker slots.
+    warm = ThreadPoolExecutor(max_workers=_PREWARM_WORKERS)
+    try:
+        warm.submit(_prewarm_hosts, warm, urls, args.site)
+        with ThreadPoolExecutor(max_workers=max(1, min(args.jobs, len(urls)))) as pool:
+            codes = list(
+                pool.map(lambda u, out: _download_url(u, args.site, out, args.use_ffmpeg), urls, out_paths)
+            )
+    finally:
+        # warm-ups still queued once the batch is done are pointless
+        warm.shutdown(wait=False, cancel_futures=True)
+    return next((code for code in codes if code), 0)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -1,18 +1,18 @@
 """Downloader for amateurdoporn-like sites.
 
 This module looks for .m3u8 URLs on the page or inside an iframe and downloads
-the HLS stream using ffmpeg with appropriate headers. It's similar to eroleaked
+the HLS stream with the native segment downloader (or ffmpeg, on request) using
+appropriate headers. It's similar to eroleaked
 but includes some refinements for filename derivation and fallback checks.
 """
 from __future__ import annotations
 
+import html as htmllib
 import re
 import subprocess
-from pathlib import Path
 from typing import Optional
 
-import requests
-from bs4 import BeautifulSoup
+from .. import _hls, _html, _http, _names
 
 
 USER_AGENT = (
@@ -22,44 +22,54 @@ USER_AGENT = (
 )
 REFERER = "https://amateurdoporn.com/"
 
+_SESSION = _http.new_session(USER_AGENT)
+_REFERER_HEADERS = {"Referer": REFERER}
+
+_IFRAME_RE = re.compile(r"<iframe\b[^>]*" + _html.attr("src"), re.IGNORECASE)
+_M3U8_ANY_RE = re.compile(r"(https?://[^\s'\"]+\.m3u8)")
+
 
 def fetch_page(url: str) -> str:
-    headers = {"User-Agent": USER_AGENT, "Referer": REFERER}
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = _SESSION.get(url, headers=_REFERER_HEADERS, timeout=15)
     resp.raise_for_status()
-    return resp.text
+    return _http.page_text(resp)
 
 
 def extract_iframe_src(html: str) -> Optional[str]:
-    soup = BeautifulSoup(html, "html.parser")
-    iframe = soup.select_one("iframe")
-    if iframe and iframe.has_attr("src"):
-        return iframe["src"]
-    return None
+    m = _IFRAME_RE.search(html)
+    return htmllib.unescape(_html.value(m)) if m else None
 
 
 def extract_m3u8_from_text(text: str) -> Optional[str]:
-    # look for m3u8 in any quoted context or raw
-    m = re.search(r"(https?://[^\s'\"]+\.m3u8)", text)
+    # look for m3u8 in any quoted context or raw; skip the regex when the
+    # literal suffix it anchors on is absent
+    if ".m3u8" not in text:
+        return None
+    m = _M3U8_ANY_RE.search(text)
     return m.group(1) if m else None
 
 
 def derive_filename_from_url(url: str) -> str:
-    path = url.rstrip("/")
-    name = Path(path).name
-    if not name:
-        parts = [p for p in path.split("/") if p]
-        name = parts[-1] if parts else "video"
-    name = re.sub(r"[^A-Za-z0-9._-]", "-", name)
-    return name
+    return _names.sanitize(url.rstrip("/").rpartition("/")[2] or "video")
 
 
-def download(m3u8_url: str, out_path: Optional[str] = None) -> int:
+def download(m3u8_url: str, out_path: Optional[str] = None, use_ffmpeg: bool = False) -> int:
     if not m3u8_url:
         raise ValueError("m3u8_url is required")
     if out_path is None:
         out_path = derive_filename_from_url(m3u8_url) + ".mp4"
 
+    if not use_ffmpeg:
+        try:
+            return _hls.download_hls(
+                m3u8_url,
+                out_path,
+                headers={"sec-ch-ua-platform": "\"Windows\"", "Referer": REFERER},
+                session=_SESSION,
+            )
+        except _hls.UnsupportedPlaylist:
+            pass
+
     headers = (
         "sec-ch-ua-platform: \"Windows\"\r\n"
         f"Referer: {REFERER}\r\n"
@@ -68,6 +78,7 @@ def download(m3u8_url: str, out_path: Optional[str] = None) -> int:
 
     cmd = [
         "ffmpeg",
+        "-y",
         "-headers",
         headers,
         "-i",
@@ -81,13 +92,17 @@ def download(m3u8_url: str, out_path: Optional[str] = None) -> int:
     return proc.returncode
 
 
-def full_download_from_page(url: str, out_path: Optional[str] = None) -> int:
+def full_download_from_page(url: str, out_path: Optional[str] = None, use_ffmpeg: bool = False) -> int:
+    # name the file after the page; playlist names (index.m3u8, ...) repeat across videos
+    if out_path is None:
+        out_path = derive_filename_from_url(url) + ".mp4"
+
     page_html = fetch_page(url)
 
     # 1) Try to find m3u8 directly on the page
     m3u8 = extract_m3u8_from_text(page_html)
     if m3u8:
-        return download(m3u8, out_path=out_path)
+        return download(m3u8, out_path=out_path, use_ffmpeg=use_ffmpeg)
 
     # 2) Try to find iframe and search inside it
     iframe_src = extract_iframe_src(page_html)
@@ -98,7 +113,7 @@ def full_download_from_page(url: str, out_path: Optional[str] = None) -> int:
         iframe_html = fetch_page(iframe_src)
         m3u8 = extract_m3u8_from_text(iframe_html)
         if m3u8:
-            return download(m3u8, out_path=out_path)
+            return download(m3u8, out_path=out_path, use_ffmpeg=use_ffmpeg)
 
     # 3) No m3u8 found
     raise RuntimeError("No .m3u8 URL found on page or iframe")
@@ -1,17 +1,17 @@
 """Downloader for cumslutx.com and girlxnude.com pages.
 
 This module extracts a direct .mp4 URL from the page (meta itemprop or source tag)
-and downloads it using curl with a browser User-Agent and proper Referer.
+and streams it to disk over a shared HTTP session with a browser User-Agent and proper Referer.
 """
 from __future__ import annotations
 
+import html as htmllib
+import re
 import shlex
-import subprocess
 from pathlib import Path
 from typing import Optional
 
-import requests
-from bs4 import BeautifulSoup
+from .. import _html, _http, _names, _range
 
 
 USER_AGENT = (
@@ -20,47 +20,54 @@ USER_AGENT = (
     "Chrome/141.0.0.0 Safari/537.36"
 )
 
+_SESSION = _http.new_session(USER_AGENT)
+_DL_HEADERS = {"Referer": "https://cumslutx.com/"}
+
+_META_CONTENT_URL_RE = re.compile(
+    r"<meta\b[^>]*" + _html.attr_equals("itemprop", "contentURL") + r"[^>]*>", re.IGNORECASE
+)
+_SOURCE_MP4_RE = re.compile(r"<source\b[^>]*" + _html.attr_equals("type", "video/mp4") + r"[^>]*>", re.IGNORECASE)
+_CONTENT_ATTR_RE = re.compile(_html.attr("content"), re.IGNORECASE)
+_SRC_ATTR_RE = re.compile(_html.attr("src"), re.IGNORECASE)
+_MP4_ANY_RE = re.compile(r"(https?://[^\s'\"]+\.mp4)")
+
 
 def fetch_page(url: str) -> str:
-    headers = {"User-Agent": USER_AGENT, "Referer": url}
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = _SESSION.get(url, headers={"Referer": url}, timeout=15)
     resp.raise_for_status()
-    return resp.text
+    return _http.page_text(resp)
 
 
 def extract_mp4_url(html: str) -> Optional[str]:
     """Extract .mp4 URL from meta itemprop contentURL or <source> tag."""
-    soup = BeautifulSoup(html, "html.parser")
+    # the meta and fallback lookups can only succeed on pages mentioning ".mp4"
+    has_mp4 = ".mp4" in html
+
     # meta itemprop contentURL
-    meta = soup.find("meta", {"itemprop": "contentURL"})
-    if meta and meta.has_attr("content"):
-        url = meta["content"]
+    meta = _META_CONTENT_URL_RE.search(html) if has_mp4 else None
+    content = _CONTENT_ATTR_RE.search(meta.group(0)) if meta else None
+    if content:
+        url = htmllib.unescape(_html.value(content))
         if url.endswith(".mp4"):
             return url
 
     # <source type="video/mp4" src="...">
-    source = soup.find("source", {"type": "video/mp4"})
-    if source and source.has_attr("src"):
-        return source["src"]
+    source = _SOURCE_MP4_RE.search(html)
+    src = _SRC_ATTR_RE.search(source.group(0)) if source else None
+    if src:
+        return htmllib.unescape(_html.value(src))
 
-    # fallback: search for .mp4 in the page text
-    import re
+    if not has_mp4:
+        return None
 
-    m = re.search(r"(https?://[^\s'\"]+\.mp4)", str(html))
+    # fallback: search for .mp4 in the page text
+    m = _MP4_ANY_RE.search(html)
     return m.group(1) if m else None
 
 
 def derive_filename_from_url(url: str) -> str:
     # url like https://cumslutx.com/<name>/ -> derive <name>
-    from urllib.parse import urlparse
-
-    parsed = urlparse(url)
-    parts = [p for p in parsed.path.split("/") if p]
-    name = parts[-1] if parts else "video"
-    # sanitize
-    import re
-
-    name = re.sub(r"[^A-Za-z0-9._-]", "-", name)
+    name = _names.sanitize(_names.url_basename(url) or "video")
     if not name.lower().endswith(".mp4"):
         name = name + ".mp4"
     return name
@@ -72,21 +79,9 @@ def download(mp4_url: str, out_path: Optional[str] = None) -> int:
     if out_path is None:
         out_path = derive_filename_from_url(mp4_url)
 
-    cmd = [
-        "curl",
-        "-L",
-        "--fail",
-        "--output",
-        out_path,
-        "--user-agent",
-        USER_AGENT,
-        "--referer",
-        "https://cumslutx.com/",
-        mp4_url,
-    ]
-
-    proc = subprocess.run(cmd)
-    return proc.returncode
+    if not _range.parallel_download(_SESSION, mp4_url, out_path, headers=_DL_HEADERS):
+        _http.stream_to_file(_SESSION, mp4_url, out_path, headers=_DL_HEADERS)
+    return 0
 
 
 def full_download_from_page(url: str, out_path: Optional[str] = None) -> int:
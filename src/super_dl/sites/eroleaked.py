@@ -2,19 +2,20 @@
 
 This module fetches a page, extracts the iframe URL from the player, follows the iframe,
 finds a .m3u8 playlist URL, derives a filename from the original page URL, and downloads
-the stream using ffmpeg with custom headers.
+the stream with the native segment downloader (or ffmpeg, on request) using custom headers.
 """
 from __future__ import annotations
 
+import html as htmllib
 import re
 import shlex
 import subprocess
-from pathlib import Path
 from typing import Optional
 
-import requests
 from bs4 import BeautifulSoup
 
+from .. import _hls, _html, _http, _names
+
 
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -23,16 +24,33 @@ USER_AGENT = (
 )
 REFERER = "https://eroleaked.com/"
 
+_SESSION = _http.new_session(USER_AGENT)
+_REFERER_HEADERS = {"Referer": REFERER}
+
+_IFRAME_TAG_RE = re.compile(r"<iframe\b", re.IGNORECASE)
+_IFRAME_SRC_RE = re.compile(r"<iframe\b[^>]*" + _html.attr("src"), re.IGNORECASE)
+_M3U8_ANY_RE = re.compile(r"(https?://[^\s'\"]+\.m3u8)")
+
 
 def fetch_page(url: str) -> str:
-    headers = {"User-Agent": USER_AGENT, "Referer": REFERER}
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = _SESSION.get(url, headers=_REFERER_HEADERS, timeout=15)
     resp.raise_for_status()
-    return resp.text
+    return _http.page_text(resp)
 
 
 def extract_iframe_src(html: str) -> Optional[str]:
     """Extract the src value of the iframe inside .video-player -> .responsive-player."""
+    # fast path: with at most one iframe there is nothing to disambiguate, so the
+    # player-context lookup below would pick the same tag a regex does
+    iframe_count = len(_IFRAME_TAG_RE.findall(html))
+    if not iframe_count:
+        return None
+    if iframe_count == 1:
+        m = _IFRAME_SRC_RE.search(html)
+        if m:
+            return htmllib.unescape(_html.value(m))
+        # markup the regex cannot read; let the parser decide
+
     soup = BeautifulSoup(html, "html.parser")
     # try to find iframe inside the responsive-player or video-player
     iframe = soup.select_one(".video-player .responsive-player iframe")
@@ -47,31 +65,24 @@ def extract_iframe_src(html: str) -> Optional[str]:
 
 def extract_m3u8_from_html(html: str) -> Optional[str]:
     """Search for the first .m3u8 URL in the HTML text."""
-    page_text = str(html)
-    m3u8_matches = re.findall(r"(https?://[^\s'\"]+\.m3u8)", page_text)
-    if m3u8_matches:
-        return m3u8_matches[0]
-    return None
+    if ".m3u8" not in html:
+        return None
+    m = _M3U8_ANY_RE.search(html)
+    return m.group(1) if m else None
 
 
 def derive_filename_from_url(url: str) -> str:
     """Given a page URL like https://eroleaked.com/2025/08/18/<slug>/, derive a base filename."""
-    # strip trailing slash
-    path = url.rstrip("/")
-    name = Path(path).name
-    if not name:
-        # fallback to last meaningful path segment
-        parts = [p for p in path.split("/") if p]
-        name = parts[-1] if parts else "video"
-    # sanitize (keep simple chars)
-    name = re.sub(r"[^A-Za-z0-9._-]", "-", name)
-    return name
-
-
-def download(m3u8_url: str, out_path: Optional[str] = None) -> int:
-    """Download the HLS stream using ffmpeg with custom headers.
-
-    Returns ffmpeg process return code.
+    # last segment after stripping the trailing slash, sanitized to simple chars
+    return _names.sanitize(url.rstrip("/").rpartition("/")[2] or "video")
+
+
+def download(m3u8_url: str, out_path: Optional[str] = None, use_ffmpeg: bool = False) -> int:
+    """Download the HLS stream with custom headers.
+
+    Segments are fetched natively; ffmpeg is used when use_ffmpeg is set or the
+    playlist needs it (e.g. encrypted segments). Returns 0 or the ffmpeg process
+    return code.
     """
     if not m3u8_url:
         raise ValueError("m3u8_url is required")
@@ -79,17 +90,26 @@ def download(m3u8_url: str, out_path: Optional[str] = None) -> int:
     if out_path is None:
         out_path = derive_filename_from_url(REFERER) + ".mp4"
 
-    # Build ffmpeg headers string as shown in the prompt
-    headers = (
-        "sec-ch-ua-platform: \"Windows\"\r\n"
-        f"Referer: {REFERER}\r\n"
-        f"User-Agent: {USER_AGENT}\r\n"
-        "sec-ch-ua: \"Google Chrome\";v=\"141\", \"Not?A_Brand\";v=\"8\", \"Chromium\";v=\"141\"\r\n"
-        "sec-ch-ua-mobile: ?0\r\n"
-    )
+    stream_headers = {
+        "sec-ch-ua-platform": "\"Windows\"",
+        "Referer": REFERER,
+        "User-Agent": USER_AGENT,
+        "sec-ch-ua": "\"Google Chrome\";v=\"141\", \"Not?A_Brand\";v=\"8\", \"Chromium\";v=\"141\"",
+        "sec-ch-ua-mobile": "?0",
+    }
+
+    if not use_ffmpeg:
+        try:
+            return _hls.download_hls(m3u8_url, out_path, headers=stream_headers, session=_SESSION)
+        except _hls.UnsupportedPlaylist:
+            pass
+
+    # Build ffmpeg headers string from the same header set
+    headers = "".join(f"{name}: {value}\r\n" for name, value in stream_headers.items())
 
     cmd = [
         "ffmpeg",
+        "-y",
         "-headers",
         headers,
         "-i",
@@ -104,8 +124,8 @@ def download(m3u8_url: str, out_path: Optional[str] = None) -> int:
     return proc.returncode
 
 
-def full_download_from_page(url: str, out_path: Optional[str] = None) -> int:
-    """High-level helper: fetch page, extract iframe->m3u8, and download via ffmpeg."""
+def full_download_from_page(url: str, out_path: Optional[str] = None, use_ffmpeg: bool = False) -> int:
+    """High-level helper: fetch page, extract iframe->m3u8, and download the stream."""
     page_html = fetch_page(url)
     iframe_src = extract_iframe_src(page_html)
     if not iframe_src:
@@ -126,4 +146,4 @@ def full_download_from_page(url: str, out_path: Optional[str] = None) -> int:
         out_base = derive_filename_from_url(url)
         out_path = f"{out_base}.mp4"
 
-    return download(m3u8, out_path=out_path)
+    return download(m3u8, out_path=out_path, use_ffmpeg=use_ffmpeg)
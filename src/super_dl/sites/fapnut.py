@@ -8,8 +8,9 @@ implements:
 - extract_m3u8_from_html(html) -> Optional[str]
 - download(m3u8_url, out_path=None) -> int
 
-The download function shells out to ffmpeg to download an m3u8 stream and
-save it as an .mp4 file when invoked from the CLI. Tests do not run ffmpeg.
+The download function fetches the stream segments natively and saves them as
+an .mp4 file; with use_ffmpeg=True (or for playlists the native downloader does
+not support) it shells out to ffmpeg instead. Tests do not run ffmpeg.
 """
 from __future__ import annotations
 
@@ -21,7 +22,7 @@ import subprocess
 from pathlib import Path
 from typing import Optional
 
-import requests
+from .. import _hls, _http, _names
 
 
 USER_AGENT = (
@@ -30,19 +31,30 @@ USER_AGENT = (
     "Chrome/114.0.0.0 Safari/537.36"
 )
 
+_SESSION = _http.new_session(USER_AGENT)
+_REFERER_HEADERS = {"Referer": "https://fapnut.net/"}
+
+# resolved once at import; download() only needs it for the ffmpeg fallback
+_FFMPEG = shutil.which("ffmpeg")
+
+_IFRAME_RE = re.compile(r'<iframe[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
+_M3U8_SRC_RE = re.compile(r'src=["\'](https?://[^"\']+?\.m3u8[^"\']*)["\']', re.IGNORECASE)
+_M3U8_ANY_RE = re.compile(r'(https?://[^"\']+?\.m3u8\b[^"\']*)', re.IGNORECASE)
+# plain literal both patterns require; one linear scan, no backtracking
+_M3U8_HINT_RE = re.compile(r"\.m3u8", re.IGNORECASE)
+
 
 def fetch_page(url: str) -> Optional[str]:
-    headers = {"User-Agent": USER_AGENT, "Referer": "https://fapnut.net/"}
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = _SESSION.get(url, headers=_REFERER_HEADERS, timeout=15)
     resp.raise_for_status()
-    return resp.text
+    return _http.page_text(resp)
 
 
 def extract_iframe_src(html: str) -> Optional[str]:
     """Find the first iframe src on the page."""
     if not html:
         return None
-    m = re.search(r'<iframe[^>]+src=["\']([^"\']+)["\']', html, re.IGNORECASE)
+    m = _IFRAME_RE.search(html)
     if m:
         return m.group(1)
     return None
@@ -53,16 +65,16 @@ def extract_m3u8_from_html(html: str) -> Optional[str]:
 
     Looks for direct .m3u8 links in src attributes or JS variables.
     """
-    if not html:
+    if not html or not _M3U8_HINT_RE.search(html):
         return None
 
     # look for src="https://.../playlist.m3u8"
-    m = re.search(r'src=["\'](https?://[^"\']+?\.m3u8[^"\']*)["\']', html, re.IGNORECASE)
+    m = _M3U8_SRC_RE.search(html)
     if m:
         return m.group(1)
 
     # look for plain http(s) .m3u8 anywhere
-    m2 = re.search(r'(https?://[^"\']+?\.m3u8\b[^"\']*)', html, re.IGNORECASE)
+    m2 = _M3U8_ANY_RE.search(html)
     if m2:
         return m2.group(1)
 
@@ -71,34 +83,26 @@ def extract_m3u8_from_html(html: str) -> Optional[str]:
 
 def _filename_from_page_url(page_url: str) -> str:
     """Derive a filename from the page URL: https://fapnut.net/<name>/ -> <name>.mp4"""
-    from urllib.parse import urlparse
-
-    parsed = urlparse(page_url)
-    path = parsed.path.strip("/")
-    if not path:
-        return "fapnut.mp4"
-    # take last segment
-    name = path.split("/")[-1]
-    if not name:
-        name = "fapnut"
+    name = _names.url_basename(page_url) or "fapnut"
     return f"{name}.mp4"
 
 
-def download(m3u8_url: str, out_path: Optional[str] = None, page_url: Optional[str] = None) -> int:
-    """Download the m3u8 using ffmpeg.
+def download(
+    m3u8_url: str,
+    out_path: Optional[str] = None,
+    page_url: Optional[str] = None,
+    use_ffmpeg: bool = False,
+) -> int:
+    """Download the m3u8 stream.
 
-    If ffmpeg is not available, raise a RuntimeError. When out_path is not
-    provided, the filename is derived from page_url if given, otherwise from
-    the m3u8 URL.
+    Segments are fetched natively unless use_ffmpeg is set or the playlist
+    needs ffmpeg; if ffmpeg is then not available, raise a RuntimeError. When
+    out_path is not provided, the filename is derived from page_url if given,
+    otherwise from the m3u8 URL.
     """
     if not m3u8_url:
         raise ValueError("m3u8_url is empty or None")
 
-    # Find ffmpeg
-    ffmpeg_path = shutil.which("ffmpeg")
-    if not ffmpeg_path:
-        raise RuntimeError("ffmpeg is required to download m3u8 streams")
-
     if out_path:
         out_file = Path(out_path)
     else:
@@ -106,17 +110,25 @@ def download(m3u8_url: str, out_path: Optional[str] = None, page_url: Optional[s
             out_file = Path(os.getcwd()) / _filename_from_page_url(page_url)
         else:
             # fallback: use last path segment of m3u8
-            from urllib.parse import urlparse
-
-            parsed = urlparse(m3u8_url)
-            name = Path(parsed.path).name or "fapnut"
+            name = _names.url_basename(m3u8_url) or "fapnut"
             out_file = Path(os.getcwd()) / f"{name}.mp4"
 
     out_file.parent.mkdir(parents=True, exist_ok=True)
 
+    if not use_ffmpeg:
+        try:
+            return _hls.download_hls(
+                m3u8_url, str(out_file), headers=_REFERER_HEADERS, session=_SESSION
+            )
+        except _hls.UnsupportedPlaylist:
+            pass
+
+    if not _FFMPEG:
+        raise RuntimeError("ffmpeg is required to download m3u8 streams")
+
     # Build ffmpeg command to download HLS stream and save as mp4
     cmd = [
-        ffmpeg_path,
+        _FFMPEG,
         "-y",
         "-hide_banner",
         "-loglevel",
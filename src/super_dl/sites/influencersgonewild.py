@@ -2,17 +2,17 @@
 
 This module provides:
 - extract_mp4_url(html): parse HTML and return .mp4 URL (or None)
-- download(url, out_path=None): download the mp4 using wget with required headers
+- download(url, out_path=None): stream the mp4 to disk with the required headers
 """
 from __future__ import annotations
 
+import html as htmllib
+import re
 import shlex
-import subprocess
 from pathlib import Path
 from typing import Optional
 
-import requests
-from bs4 import BeautifulSoup
+from .. import _html, _http, _names, _range
 
 
 USER_AGENT = (
@@ -22,54 +22,51 @@ USER_AGENT = (
 )
 REFERER = "https://influencersgonewild.com/"
 
+_SESSION = _http.new_session(USER_AGENT)
+_REFERER_HEADERS = {"Referer": REFERER}
+
+_SOURCE_MP4_RE = re.compile(r"<source\b[^>]*" + _html.attr_equals("type", "video/mp4") + r"[^>]*>", re.IGNORECASE)
+_SRC_ATTR_RE = re.compile(_html.attr("src"), re.IGNORECASE)
+
 
 def extract_mp4_url(html: str) -> Optional[str]:
     """Extract .mp4 video URL from HTML content.
 
     Returns the first <source type="video/mp4" src="..."> value found, or None.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    source_tag = soup.find("source", {"type": "video/mp4"})
-    if source_tag and source_tag.has_attr("src"):
-        return source_tag["src"]
-    return None
+    if "video/mp4" not in html:
+        return None
+    source_tag = _SOURCE_MP4_RE.search(html)
+    src = _SRC_ATTR_RE.search(source_tag.group(0)) if source_tag else None
+    return htmllib.unescape(_html.value(src)) if src else None
 
 
 def download(mp4_url: str, out_path: Optional[str] = None) -> int:
-    """Download the mp4 URL using wget with the required UA and referer.
+    """Download the mp4 URL with the required UA and referer.
 
     - mp4_url: direct URL to the .mp4 file
-    - out_path: optional file path to save to; if None, wget chooses filename
+    - out_path: optional file path to save to; if None, the last path segment
+      of the URL is used as filename
 
-    Returns subprocess exit code (0 on success).
+    Returns 0 on success; HTTP errors raise `requests.HTTPError`.
     """
     if not mp4_url:
         raise ValueError("mp4_url is empty or None")
 
-    cmd = [
-        "wget",
-        "--user-agent",
-        USER_AGENT,
-        "--referer",
-        REFERER,
-    ]
-
     if out_path:
         out_dir = Path(out_path).parent
         if out_dir and not out_dir.exists():
             out_dir.mkdir(parents=True, exist_ok=True)
-        cmd += ["-O", str(out_path)]
-
-    cmd.append(mp4_url)
+    else:
+        out_path = _names.url_basename(mp4_url) or "video.mp4"
 
-    # Use subprocess to run wget
-    proc = subprocess.run(cmd)
-    return proc.returncode
+    if not _range.parallel_download(_SESSION, mp4_url, str(out_path), headers=_REFERER_HEADERS):
+        _http.stream_to_file(_SESSION, mp4_url, str(out_path), headers=_REFERER_HEADERS)
+    return 0
 
 
 def fetch_page(url: str) -> Optional[str]:
     """Fetch page HTML with a browser-like user-agent and referer set to the site root."""
-    headers = {"User-Agent": USER_AGENT, "Referer": REFERER}
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = _SESSION.get(url, headers=_REFERER_HEADERS, timeout=15)
     resp.raise_for_status()
-    return resp.text
+    return _http.page_text(resp)
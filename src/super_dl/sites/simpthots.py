@@ -1,15 +1,16 @@
 """Downloader for simpthots.com pages.
 
-Extracts .mp4 from OpenGraph meta tags or from page contents and downloads via curl.
+Extracts .mp4 from OpenGraph meta tags or from page contents and streams it to disk
+over a shared HTTP session.
 """
 from __future__ import annotations
 
-import subprocess
+import html as htmllib
+import re
 from pathlib import Path
 from typing import Optional
 
-import requests
-from bs4 import BeautifulSoup
+from .. import _html, _http, _names, _range
 
 
 USER_AGENT = (
@@ -19,38 +20,46 @@ USER_AGENT = (
 )
 REFERER = "https://simpthots.com/"
 
+_SESSION = _http.new_session(USER_AGENT)
+_DL_HEADERS = {"Referer": REFERER}
+
+# any meta tag with a property; extract_mp4_url keeps the og:video* ones
+_PROPERTY_META_RE = re.compile(r"<meta\b[^>]*" + _html.attr("property") + r"[^>]*>", re.IGNORECASE)
+_CONTENT_ATTR_RE = re.compile(_html.attr("content"), re.IGNORECASE)
+_OG_VIDEO_PROPS = ("og:video", "og:video:secure_url")
+_MP4_ANY_RE = re.compile(r"(https?://[^\s'\"]+\.mp4)")
+
 
 def fetch_page(url: str) -> str:
-    headers = {"User-Agent": USER_AGENT, "Referer": url}
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = _SESSION.get(url, headers={"Referer": url}, timeout=15)
     resp.raise_for_status()
-    return resp.text
+    return _http.page_text(resp)
 
 
 def extract_mp4_url(html: str) -> Optional[str]:
-    soup = BeautifulSoup(html, "html.parser")
-    og = soup.find("meta", {"property": "og:video"})
-    if og and og.has_attr("content"):
-        return og["content"]
-    og2 = soup.find("meta", {"property": "og:video:secure_url"})
-    if og2 and og2.has_attr("content"):
-        return og2["content"]
+    # single pass over the og:video* meta tags; og:video wins over og:video:secure_url
+    og_videos = {}
+    if "og:video" in html:
+        for og in _PROPERTY_META_RE.finditer(html):
+            prop = _html.value(og).lower()
+            if prop not in _OG_VIDEO_PROPS:
+                continue
+            content = _CONTENT_ATTR_RE.search(og.group(0))
+            if content and prop not in og_videos:
+                og_videos[prop] = _html.value(content)
+                if prop == "og:video":
+                    break
+    og_video = og_videos.get("og:video") or og_videos.get("og:video:secure_url")
+    if og_video:
+        return htmllib.unescape(og_video)
 
     # fallback: search for .mp4 in page
-    import re
-
-    m = re.search(r"(https?://[^\s'\"]+\.mp4)", str(html))
+    m = _MP4_ANY_RE.search(html)
     return m.group(1) if m else None
 
 
 def derive_filename_from_url(url: str) -> str:
-    from urllib.parse import urlparse
-    import re
-
-    parsed = urlparse(url)
-    parts = [p for p in parsed.path.split("/") if p]
-    name = parts[-1] if parts else "video"
-    name = re.sub(r"[^A-Za-z0-9._-]", "-", name)
+    name = _names.sanitize(_names.url_basename(url) or "video")
     if not name.lower().endswith(".mp4"):
         name = name + ".mp4"
     return name
@@ -62,21 +71,9 @@ def download(mp4_url: str, out_path: Optional[str] = None) -> int:
     if out_path is None:
         out_path = derive_filename_from_url(mp4_url)
 
-    cmd = [
-        "curl",
-        "-L",
-        "--fail",
-        "--output",
-        out_path,
-        "--user-agent",
-        USER_AGENT,
-        "--referer",
-        REFERER,
-        mp4_url,
-    ]
-
-    proc = subprocess.run(cmd)
-    return proc.returncode
+    if not _range.parallel_download(_SESSION, mp4_url, out_path, headers=_DL_HEADERS):
+        _http.stream_to_file(_SESSION, mp4_url, out_path, headers=_DL_HEADERS)
+    return 0
 
 
 def full_download_from_page(url: str, out_path: Optional[str] = None) -> int:
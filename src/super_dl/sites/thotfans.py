@@ -12,12 +12,11 @@ uses the last path segment as filename when no output path is provided.
 from __future__ import annotations
 
 import os
-import random
 import re
 from pathlib import Path
 from typing import Optional
 
-import requests
+from .. import _http, _names, _range
 
 
 USER_AGENT = (
@@ -26,12 +25,28 @@ USER_AGENT = (
     "Chrome/114.0.0.0 Safari/537.36"
 )
 
+_SESSION = _http.new_session(USER_AGENT)
+# browser-like download headers; the User-Agent comes from the session
+_DL_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "DNT": "1",
+}
+
+_MP4_SOURCE_RE = re.compile(r'<source[^>]+src=["\'](https?://[^"\']+?\.mp4)["\']', re.IGNORECASE)
+_MP4_ANCHOR_RE = re.compile(r'<a[^>]+href=["\'](https?://[^"\']+?\.mp4)["\']', re.IGNORECASE)
+_MP4_ANY_RE = re.compile(r'(https?://[^"\'" >]+?\.mp4)')
+# plain literal all three patterns require; one linear scan, no backtracking
+_MP4_HINT_RE = re.compile(r"\.mp4", re.IGNORECASE)
+
 
 def fetch_page(url: str) -> Optional[str]:
-    headers = {"User-Agent": USER_AGENT}
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = _SESSION.get(url, timeout=15)
     resp.raise_for_status()
-    return resp.text
+    return _http.page_text(resp)
 
 
 def extract_mp4_url(html: str) -> Optional[str]:
@@ -41,21 +56,21 @@ def extract_mp4_url(html: str) -> Optional[str]:
     <source type="video/mp4" src="https://cdn.thotfans.com/.../file.mp4" />
     <a href="https://cdn.thotfans.com/.../file.mp4">...
     """
-    if not html:
+    if not html or not _MP4_HINT_RE.search(html):
         return None
 
     # Prefer the src attribute on <source> tags
-    m = re.search(r'<source[^>]+src=["\'](https?://[^"\']+?\.mp4)["\']', html, re.IGNORECASE)
+    m = _MP4_SOURCE_RE.search(html)
     if m:
         return m.group(1)
 
     # Look for anchor hrefs linking to .mp4
-    m2 = re.search(r'<a[^>]+href=["\'](https?://[^"\']+?\.mp4)["\']', html, re.IGNORECASE)
+    m2 = _MP4_ANCHOR_RE.search(html)
     if m2:
         return m2.group(1)
 
     # Fallback: any .mp4 URL in the document
-    m3 = re.search(r'(https?://[^"\'" >]+?\.mp4)', html)
+    m3 = _MP4_ANY_RE.search(html)
     if m3:
         return m3.group(1)
 
@@ -63,17 +78,14 @@ def extract_mp4_url(html: str) -> Optional[str]:
 
 
 def _append_random_rnd(url: str) -> str:
-    rnd = random.randrange(10**12, 10**14)
+    # 48-bit cache-buster (14-15 digits) straight from the OS, no PRNG state or bignum math
+    rnd = int.from_bytes(os.urandom(6), "little") | (1 << 46)
     sep = "&" if "?" in url else "?"
     return f"{url}{sep}rnd={rnd}"
 
 
 def _filename_from_url(url: str) -> str:
-    from urllib.parse import urlparse
-    parsed = urlparse(url)
-    path = parsed.path.rstrip("/")
-    name = os.path.basename(path)
-    return name
+    return _names.url_basename(url)
 
 
 def download(mp4_url: str, out_path: Optional[str] = None) -> int:
@@ -82,16 +94,6 @@ def download(mp4_url: str, out_path: Optional[str] = None) -> int:
 
     url_with_rnd = _append_random_rnd(mp4_url)
 
-    headers = {
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Cache-Control": "no-cache",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-        "User-Agent": USER_AGENT,
-        "DNT": "1",
-    }
-
     if out_path:
         out_file = Path(out_path)
     else:
@@ -100,14 +102,7 @@ def download(mp4_url: str, out_path: Optional[str] = None) -> int:
 
     out_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with requests.get(url_with_rnd, headers=headers, stream=True, timeout=30) as r:
-        try:
-            r.raise_for_status()
-        except Exception:
-            raise
-        with open(out_file, "wb") as fh:
-            for chunk in r.iter_content(chunk_size=8192):
-                if chunk:
-                    fh.write(chunk)
+    if not _range.parallel_download(_SESSION, url_with_rnd, str(out_file), headers=_DL_HEADERS, timeout=30):
+        _http.stream_to_file(_SESSION, url_with_rnd, str(out_file), headers=_DL_HEADERS, timeout=30)
 
     return 0
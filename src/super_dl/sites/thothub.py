@@ -8,18 +8,25 @@ This module provides the minimal interface expected by `super_dl.main`:
 Behavior notes:
 - extract_mp4_url looks for a JS snippet containing "video_url: 'function/0/<mp4>'"
 - download appends a random ?rnd=<int> query parameter, sends browser-like headers,
-  and streams the response to disk using the last path segment of the URL as filename
-  when out_path is not provided.
+  and streams the response to disk (with parallel Range requests when the server
+  supports them) using the last path segment of the URL as filename when out_path
+  is not provided.
+- The 4 MiB write buffer, adaptive read size, overlapped writer and size
+  preallocation apply to the single-stream fallback only; ranged downloads use
+  `_range`'s own chunking. Both paths drop the finished file from the page cache.
 """
 from __future__ import annotations
 
+import functools
 import os
 import random
 import re
-from pathlib import Path
-from typing import Optional
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Optional
 
-import requests
+from .. import _http, _names, _range
 
 
 USER_AGENT = (
@@ -28,12 +35,39 @@ USER_AGENT = (
     "Chrome/114.0.0.0 Safari/537.36"
 )
 
+# initial read size for the streamed download; large enough that a multi-hundred-MB
+# file costs a few thousand syscalls rather than hundreds of thousands
+CHUNK_SIZE = 1 << 18
+# the read size then follows the measured rate, once per window, within these bounds
+MIN_READ_SIZE = 16 << 10
+MAX_READ_SIZE = 2 << 20
+_RATE_WINDOW = 1.0
+# the output file's buffer collects reads and flushes them in 4 MiB writes
+WRITE_BUFFER_SIZE = 4 << 20
+# blocks read ahead of the disk writer before the reader waits for it
+MAX_PENDING_WRITES = 4
+
+_SESSION = _http.new_session(USER_AGENT)
+# browser-like download headers; the User-Agent comes from the session. The mp4
+# is already compressed, so ask for it as-is rather than gzip-wrapped
+_DL_HEADERS = {
+    "Accept-Encoding": "identity",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "DNT": "1",
+}
+
+_VIDEO_URL_RE = re.compile(r"video_url:\s*'function/0/(https?://[^']+\.mp4)\b")
+_FALLBACK_MP4_RE = re.compile(r'(https?://[^" ]+?\.mp4)')
+
 
 def fetch_page(url: str) -> Optional[str]:
-    headers = {"User-Agent": USER_AGENT}
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = _SESSION.get(url, timeout=15)
     resp.raise_for_status()
-    return resp.text
+    return _http.page_text(resp)
 
 
 def extract_mp4_url(html: str) -> Optional[str]:
@@ -44,37 +78,105 @@ def extract_mp4_url(html: str) -> Optional[str]:
 
     We capture the https://... .mp4 portion.
     """
-    if not html:
+    # both patterns need the literal ".mp4"; empty pages and pages without it
+    # are rejected before any regex runs
+    first_mp4 = html.find(".mp4") if html else -1
+    if first_mp4 < 0:
         return None
 
-    # Look for video_url: 'function/0/<https...mp4>'
-    pattern = re.compile(r"video_url:\s*'function/0/(https?://[^']+\.mp4)\b")
-    m = pattern.search(html)
-    if m:
-        return m.group(1)
-
-    # Fallback: look for any .mp4 URL in the page
-    m2 = re.search(r'(https?://[^" ]+?\.mp4)', html)
+    # Look for video_url: 'function/0/<https...mp4>'. The pattern starts with
+    # a literal key, so anchor it at each occurrence instead of scanning
+    i = html.find("video_url:")
+    while i >= 0:
+        m = _VIDEO_URL_RE.match(html, i)
+        if m:
+            return m.group(1)
+        i = html.find("video_url:", i + 10)
+
+    # Fallback: look for any .mp4 URL in the page. A match cannot span a quote
+    # or a space, so none can start before the last one preceding the first ".mp4"
+    start = max(html.rfind('"', 0, first_mp4), html.rfind(" ", 0, first_mp4)) + 1
+    m2 = _FALLBACK_MP4_RE.search(html, start)
     if m2:
         return m2.group(1)
 
     return None
 
 
+@functools.lru_cache(maxsize=8)
+def extract_mp4_url_cached(html: str) -> Optional[str]:
+    """Memoized `extract_mp4_url` for callers that re-extract from the same page.
+
+    Keyed by the page text itself (str caches its hash), so a hit costs one
+    comparison instead of a scan. maxsize is kept small because every entry pins
+    a whole page in memory.
+    """
+    return extract_mp4_url(html)
+
+
 def _append_random_rnd(url: str) -> str:
-    rnd = random.randrange(10**12, 10**14)
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}rnd={rnd}"
+    # 14-digit cache-buster from one getrandbits call, no rejection sampling
+    rnd = random.getrandbits(45) | (1 << 45)
+    return url + ("&rnd=" if "?" in url else "?rnd=") + str(rnd)
 
 
 def _filename_from_url(url: str) -> str:
-    # Use urlparse to handle query strings and trailing slashes robustly
-    from urllib.parse import urlparse
-    parsed = urlparse(url)
-    # parsed.path may end with a slash; strip trailing slashes first
-    path = parsed.path.rstrip("/")
-    name = os.path.basename(path)
-    return name
+    return _names.url_basename(url)
+
+
+def _next_read_size(size: int, rate: float) -> int:
+    """Return the read size to use after measuring rate (bytes/s) at size.
+
+    Doubles when a second of data takes more than 32 reads and halves when it
+    takes fewer than 4, so fast links use few large reads and slow ones do not
+    wait long on each block.
+    """
+    reads_per_sec = rate / size
+    if reads_per_sec > 32:
+        return min(size * 2, MAX_READ_SIZE)
+    if reads_per_sec < 4:
+        return max(size // 2, MIN_READ_SIZE)
+    return size
+
+
+def _copy_overlapped(src: BinaryIO, fh: BinaryIO) -> None:
+    """Copy src into fh, writing on a helper thread so the next read overlaps the write.
+
+    Both the socket read and the file write release the GIL; at most
+    MAX_PENDING_WRITES blocks are held in memory. The read size adapts to the
+    throughput measured over each _RATE_WINDOW.
+    """
+    pending: deque = deque()
+    size = CHUNK_SIZE
+    window_start = time.monotonic()
+    window_bytes = 0
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        while True:
+            block = src.read(size)
+            if not block:
+                break
+            window_bytes += len(block)
+            elapsed = time.monotonic() - window_start
+            if elapsed >= _RATE_WINDOW:
+                size = _next_read_size(size, window_bytes / elapsed)
+                window_start += elapsed
+                window_bytes = 0
+            # a single worker runs the writes in submission order
+            pending.append(writer.submit(fh.write, block))
+            if len(pending) > MAX_PENDING_WRITES:
+                pending.popleft().result()
+        for future in pending:
+            future.result()
+
+
+def _drop_page_cache(fd: int) -> None:
+    """Advise the kernel to drop fd's cached pages where posix_fadvise exists.
+
+    The finished file is not read back; pages already written back are released
+    instead of evicting other data, dirty ones are left to the normal flusher.
+    """
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
 
 
 def download(mp4_url: str, out_path: Optional[str] = None) -> int:
@@ -87,36 +189,46 @@ def download(mp4_url: str, out_path: Optional[str] = None) -> int:
 
     url_with_rnd = _append_random_rnd(mp4_url)
 
-    headers = {
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Cache-Control": "no-cache",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-        "User-Agent": USER_AGENT,
-        "DNT": "1",
-    }
-
     # Prepare output filename
-    if out_path:
-        out_file = Path(out_path)
-    else:
-        filename = _filename_from_url(mp4_url)
-        out_file = Path(os.getcwd()) / filename
+    out_file = os.fspath(out_path) if out_path else os.path.join(os.getcwd(), _filename_from_url(mp4_url))
 
     # Ensure parent dir exists
-    out_file.parent.mkdir(parents=True, exist_ok=True)
+    parent = os.path.dirname(out_file)
+    if parent and not os.path.isdir(parent):
+        os.makedirs(parent, exist_ok=True)
+
+    # Large files on range-capable servers are fetched in parallel parts
+    if _range.parallel_download(_SESSION, url_with_rnd, out_file, headers=_DL_HEADERS, timeout=30):
+        fd = os.open(out_file, os.O_RDONLY)
+        try:
+            _drop_page_cache(fd)
+        finally:
+            os.close(fd)
+        return 0
 
     # Stream download
-    with requests.get(url_with_rnd, headers=headers, stream=True, timeout=30) as r:
+    with _SESSION.get(url_with_rnd, headers=_DL_HEADERS, stream=True, timeout=30) as r:
+        r.raise_for_status()
+        # copy raw reads straight to the file, letting urllib3 undo any Content-Encoding
+        r.raw.decode_content = True
         try:
-            r.raise_for_status()
-        except Exception:
-            # propagate same exception to caller
+            with open(out_file, "wb", buffering=WRITE_BUFFER_SIZE) as fh:
+                # an unencoded body's final size is known up front; reserve it so the
+                # filesystem can allocate contiguously instead of extending per write
+                size = int(r.headers.get("Content-Length") or 0)
+                if size and r.headers.get("Content-Encoding", "identity") == "identity" and hasattr(os, "posix_fallocate"):
+                    try:
+                        os.posix_fallocate(fh.fileno(), 0, size)
+                    except OSError:
+                        # not supported by this filesystem
+                        pass
+                _copy_overlapped(r.raw, fh)
+                fh.flush()
+                _drop_page_cache(fh.fileno())
+        except BaseException:
+            # a cut-short body would leave a full-size file with a zeroed tail
+            # (the preallocated space); don't let it pass for a complete download
+            os.remove(out_file)
             raise
-        with open(out_file, "wb") as fh:
-            for chunk in r.iter_content(chunk_size=8192):
-                if chunk:
-                    fh.write(chunk)
 
     return 0
@@ -0,0 +1,29 @@
+import unittest
+from unittest import mock
+
+from super_dl.sites import amateurdoporn
+
+
+class AmateurdopornTest(unittest.TestCase):
+    def test_extract_iframe_src_quoted(self):
+        html = '<iframe width="640" src="https://player.example.com/e/1?a=1&amp;b=2"></iframe>'
+        self.assertEqual(amateurdoporn.extract_iframe_src(html), 'https://player.example.com/e/1?a=1&b=2')
+
+    def test_extract_iframe_src_unquoted(self):
+        html = '<iframe src=https://player.example.com/e/1 allowfullscreen></iframe>'
+        self.assertEqual(amateurdoporn.extract_iframe_src(html), 'https://player.example.com/e/1')
+
+    def test_extract_m3u8_from_text(self):
+        html = '<script>var src = "https://cdn.example.com/v/index.m3u8";</script>'
+        self.assertEqual(amateurdoporn.extract_m3u8_from_text(html), 'https://cdn.example.com/v/index.m3u8')
+
+    def test_default_name_follows_page(self):
+        html = '<script>var src = "https://cdn.example.com/v/index.m3u8";</script>'
+        with mock.patch.object(amateurdoporn, 'fetch_page', return_value=html), \
+                mock.patch.object(amateurdoporn, 'download', return_value=0) as download:
+            amateurdoporn.full_download_from_page('https://amateurdoporn.com/videos/some-clip/')
+        self.assertEqual(download.call_args.kwargs['out_path'], 'some-clip.mp4')
+
+
+if __name__ == '__main__':
+    unittest.main()
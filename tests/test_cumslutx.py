@@ -0,0 +1,26 @@
+import unittest
+
+from super_dl.sites import cumslutx
+
+
+class CumslutxTest(unittest.TestCase):
+    def test_extract_mp4_from_meta(self):
+        html = '<meta content="https://cdn.example.com/v/clip.mp4" itemprop="contentURL">'
+        self.assertEqual(cumslutx.extract_mp4_url(html), 'https://cdn.example.com/v/clip.mp4')
+
+    def test_extract_mp4_from_source_tag(self):
+        html = '<video><source src="https://cdn.example.com/get?id=1&amp;t=2" type="video/mp4"></video>'
+        self.assertEqual(cumslutx.extract_mp4_url(html), 'https://cdn.example.com/get?id=1&t=2')
+
+    def test_extract_mp4_unquoted_attributes(self):
+        html = '<meta itemprop=contentURL content=https://cdn.example.com/v/a.mp4>'
+        self.assertEqual(cumslutx.extract_mp4_url(html), 'https://cdn.example.com/v/a.mp4')
+        html = '<source type=video/mp4 src=https://cdn.example.com/get?id=1>'
+        self.assertEqual(cumslutx.extract_mp4_url(html), 'https://cdn.example.com/get?id=1')
+
+    def test_derive_filename_from_url(self):
+        self.assertEqual(cumslutx.derive_filename_from_url('https://cumslutx.com/some-name/'), 'some-name.mp4')
+
+
+if __name__ == '__main__':
+    unittest.main()
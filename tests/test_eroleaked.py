@@ -0,0 +1,38 @@
+import unittest
+
+from super_dl.sites import eroleaked
+
+
+class EroleakedTest(unittest.TestCase):
+    def test_extract_single_iframe(self):
+        html = '<div><iframe width="1" src="https://player.example.com/e/1?a=1&amp;b=2"></iframe></div>'
+        self.assertEqual(eroleaked.extract_iframe_src(html), 'https://player.example.com/e/1?a=1&b=2')
+
+    def test_extract_single_unquoted_iframe(self):
+        html = '<div><iframe src=https://player.example.com/e/1 allowfullscreen></iframe></div>'
+        self.assertEqual(eroleaked.extract_iframe_src(html), 'https://player.example.com/e/1')
+
+    def test_single_iframe_regex_miss_uses_parser(self):
+        # the '>' inside the quoted title stops the tag regex; the parser copes
+        html = '<div><iframe title="a>b" src="https://player.example.com/e/3"></iframe></div>'
+        self.assertEqual(eroleaked.extract_iframe_src(html), 'https://player.example.com/e/3')
+
+    def test_extract_player_iframe_among_many(self):
+        html = (
+            '<iframe src="https://ads.example.com/banner"></iframe>'
+            '<div class="video-player"><div class="responsive-player">'
+            '<iframe src="https://player.example.com/e/2"></iframe>'
+            '</div></div>'
+        )
+        self.assertEqual(eroleaked.extract_iframe_src(html), 'https://player.example.com/e/2')
+
+    def test_no_iframe(self):
+        self.assertIsNone(eroleaked.extract_iframe_src('<p>nothing here</p>'))
+
+    def test_extract_m3u8(self):
+        html = '<script>file: "https://cdn.example.com/hls/index.m3u8"</script>'
+        self.assertEqual(eroleaked.extract_m3u8_from_html(html), 'https://cdn.example.com/hls/index.m3u8')
+
+
+if __name__ == '__main__':
+    unittest.main()
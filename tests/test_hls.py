@@ -0,0 +1,150 @@
+import http.server
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import requests
+
+from super_dl import _hls
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    files = {}
+    gets = 0
+
+    def do_GET(self):
+        type(self).gets += 1
+        body = self.files.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HlsPlaylistTest(unittest.TestCase):
+    def test_select_variant_highest_bandwidth(self):
+        playlist = (
+            '#EXTM3U\n'
+            '#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360\n'
+            'low/index.m3u8\n'
+            '#EXT-X-STREAM-INF:BANDWIDTH=2400000,RESOLUTION=1280x720\n'
+            'high/index.m3u8\n'
+        )
+        url = _hls.select_variant(playlist, 'https://cdn.example.com/v/master.m3u8')
+        self.assertEqual(url, 'https://cdn.example.com/v/high/index.m3u8')
+
+    def test_select_variant_separate_audio_unsupported(self):
+        playlist = (
+            '#EXTM3U\n'
+            '#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="aud",NAME="en",DEFAULT=YES,URI="audio/index.m3u8"\n'
+            '#EXT-X-STREAM-INF:BANDWIDTH=2400000,AUDIO="aud"\n'
+            'high/index.m3u8\n'
+        )
+        with self.assertRaises(_hls.UnsupportedPlaylist):
+            _hls.select_variant(playlist, 'https://cdn.example.com/v/master.m3u8')
+
+    def test_select_variant_muxed_audio_group(self):
+        # a rendition without URI means the audio is carried in the variant itself
+        playlist = (
+            '#EXTM3U\n'
+            '#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="aud",NAME="en",DEFAULT=YES\n'
+            '#EXT-X-STREAM-INF:BANDWIDTH=2400000,AUDIO="aud"\n'
+            'high/index.m3u8\n'
+        )
+        url = _hls.select_variant(playlist, 'https://cdn.example.com/v/master.m3u8')
+        self.assertEqual(url, 'https://cdn.example.com/v/high/index.m3u8')
+
+    def test_select_variant_media_playlist(self):
+        self.assertIsNone(_hls.select_variant('#EXTM3U\n#EXTINF:4,\nseg0.ts\n', 'https://x/'))
+
+    def test_parse_media_playlist(self):
+        playlist = (
+            '#EXTM3U\n#EXT-X-TARGETDURATION:4\n'
+            '#EXTINF:4.0,\nseg0.ts\n'
+            '#EXTINF:4.0,\nhttps://other.example.com/seg1.ts\n'
+            '#EXT-X-ENDLIST\n'
+        )
+        segments, is_fmp4 = _hls.parse_media_playlist(playlist, 'https://cdn.example.com/v/index.m3u8')
+        self.assertEqual(segments, ['https://cdn.example.com/v/seg0.ts', 'https://other.example.com/seg1.ts'])
+        self.assertFalse(is_fmp4)
+
+    def test_parse_fmp4_playlist(self):
+        playlist = '#EXTM3U\n#EXT-X-MAP:URI="init.mp4"\n#EXTINF:4,\nseg0.m4s\n'
+        segments, is_fmp4 = _hls.parse_media_playlist(playlist, 'https://cdn.example.com/v/index.m3u8')
+        self.assertEqual(segments[0], 'https://cdn.example.com/v/init.mp4')
+        self.assertTrue(is_fmp4)
+
+    def test_encrypted_playlist_unsupported(self):
+        playlist = '#EXTM3U\n#EXT-X-KEY:METHOD=AES-128,URI="key"\n#EXTINF:4,\nseg0.ts\n'
+        with self.assertRaises(_hls.UnsupportedPlaylist):
+            _hls.parse_media_playlist(playlist, 'https://x/')
+
+
+class DownloadHlsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.segments = [os.urandom(1000 + i) for i in range(5)]
+        files = {f'/v/seg{i}.ts': seg for i, seg in enumerate(cls.segments)}
+        files['/v/media.m3u8'] = (
+            '#EXTM3U\n' + ''.join(f'#EXTINF:4,\nseg{i}.ts\n' for i in range(5)) + '#EXT-X-ENDLIST\n'
+        ).encode()
+        files['/v/short.m3u8'] = b'#EXTM3U\n#EXTINF:4,\nseg0.ts\n#EXTINF:4,\nseg1.ts\n'
+        files['/v/broken.m3u8'] = (
+            '#EXTM3U\n#EXTINF:4,\nmissing.ts\n' + ''.join(f'#EXTINF:4,\nseg{i % 5}.ts\n' for i in range(20))
+        ).encode()
+        files['/v/master.m3u8'] = b'#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=100\nmedia.m3u8\n'
+        _Handler.files = files
+        cls.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        cls.base = f'http://127.0.0.1:{cls.server.server_address[1]}/v/'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _read(self, name):
+        with open(os.path.join(self.tmp.name, name), 'rb') as fh:
+            return fh.read()
+
+    def test_concurrent_segments_joined_in_order(self):
+        out = os.path.join(self.tmp.name, 'out.ts')
+        self.assertEqual(_hls.download_hls(self.base + 'master.m3u8', out), 0)
+        self.assertEqual(self._read('out.ts'), b''.join(self.segments))
+
+    def test_short_playlist_fetched_serially(self):
+        out = os.path.join(self.tmp.name, 'out.ts')
+        _hls.download_hls(self.base + 'short.m3u8', out)
+        self.assertEqual(self._read('out.ts'), b''.join(self.segments[:2]))
+
+    def test_failed_segment_cancels_queued_segments(self):
+        out = os.path.join(self.tmp.name, 'out.ts')
+        _Handler.gets = 0
+        with self.assertRaises(requests.HTTPError):
+            _hls.download_hls(self.base + 'broken.m3u8', out, max_workers=1)
+        self.assertFalse(os.path.exists(out))
+        # the playlist and the failing segment, not all 21 segments
+        self.assertLess(_Handler.gets, 10)
+
+    def test_missing_ffmpeg_keeps_ts_name(self):
+        out = os.path.join(self.tmp.name, 'out.mp4')
+        with mock.patch.object(_hls, '_FFMPEG', None), mock.patch('sys.stderr'):
+            _hls.download_hls(self.base + 'media.m3u8', out)
+        self.assertFalse(os.path.exists(out))
+        self.assertEqual(self._read('out.ts'), b''.join(self.segments))
+
+
+if __name__ == '__main__':
+    unittest.main()
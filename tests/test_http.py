@@ -0,0 +1,36 @@
+import unittest
+
+import requests
+
+from super_dl import _http
+
+
+def _response(body, content_type=None):
+    resp = requests.Response()
+    resp._content = body
+    if content_type is not None:
+        resp.headers['Content-Type'] = content_type
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    return resp
+
+
+class PageTextTest(unittest.TestCase):
+    def test_html_without_charset_decoded_as_utf8(self):
+        resp = _response('<p>héllo</p>'.encode('utf-8'), 'text/html')
+        self.assertEqual(_http.page_text(resp), '<p>héllo</p>')
+
+    def test_missing_content_type_decoded_as_utf8(self):
+        resp = _response('héllo'.encode('utf-8'))
+        self.assertEqual(_http.page_text(resp), 'héllo')
+
+    def test_declared_charset_respected(self):
+        resp = _response('héllo'.encode('latin-1'), 'text/html; charset=ISO-8859-1')
+        self.assertEqual(_http.page_text(resp), 'héllo')
+
+    def test_invalid_bytes_replaced(self):
+        resp = _response(b'a\xffb', 'text/html')
+        self.assertEqual(_http.page_text(resp), 'a\ufffdb')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+
+from super_dl.sites import influencersgonewild
+
+
+class InfluencersgonewildTest(unittest.TestCase):
+    def test_extract_mp4_from_source_tag(self):
+        html = '<video><source type="video/mp4" src="https://cdn.example.com/a.mp4"/></video>'
+        self.assertEqual(influencersgonewild.extract_mp4_url(html), 'https://cdn.example.com/a.mp4')
+
+    def test_extract_mp4_unquoted_attributes(self):
+        html = '<video><source type=video/mp4 src=https://cdn.example.com/a.mp4></video>'
+        self.assertEqual(influencersgonewild.extract_mp4_url(html), 'https://cdn.example.com/a.mp4')
+
+    def test_ignores_other_source_types(self):
+        html = '<video><source type="video/webm" src="https://cdn.example.com/a.webm"/></video>'
+        self.assertIsNone(influencersgonewild.extract_mp4_url(html))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from super_dl import main
+from super_dl.sites import amateurdoporn, cumslutx, fapnut
+
+
+class InferSiteTest(unittest.TestCase):
+    def test_infer_known_host(self):
+        self.assertEqual(main.infer_site_from_url('https://www.thothub.to/videos/1/'), 'thothub')
+
+    def test_infer_alias_host(self):
+        self.assertEqual(main.infer_site_from_url('http://girlxnude.com/some-video/'), 'cumslutx')
+
+    def test_infer_subdomain_with_port(self):
+        self.assertEqual(main.infer_site_from_url('https://user@cdn.fapnut.net:8443/x/'), 'fapnut')
+
+    def test_infer_unknown_host(self):
+        self.assertIsNone(main.infer_site_from_url('https://example.com/fapnut.net/'))
+        self.assertIsNone(main.infer_site_from_url(''))
+
+
+class MainArgsTest(unittest.TestCase):
+    def test_output_requires_single_url(self):
+        rc = main.main(['-o', 'out.mp4', 'https://fapnut.net/a/', 'https://fapnut.net/b/'])
+        self.assertEqual(rc, 2)
+
+    def test_read_url_list_skips_blanks_and_comments(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as fh:
+            fh.write('# batch\nhttps://fapnut.net/a/\n\n  https://fapnut.net/b/  \n')
+        try:
+            urls = main._read_url_list(fh.name)
+        finally:
+            os.remove(fh.name)
+        self.assertEqual(urls, ['https://fapnut.net/a/', 'https://fapnut.net/b/'])
+
+    def test_use_ffmpeg_ignored_by_mp4_sites(self):
+        calls = []
+
+        def full_download_from_page(url, out_path=None):
+            calls.append(url)
+            return 0
+
+        with mock.patch.object(cumslutx, 'full_download_from_page', full_download_from_page):
+            rc = main.main(['--use-ffmpeg', 'https://cumslutx.com/x/'])
+        self.assertEqual(rc, 0)
+        self.assertEqual(calls, ['https://cumslutx.com/x/'])
+
+    def test_use_ffmpeg_forwarded_to_hls_sites(self):
+        calls = []
+
+        def full_download_from_page(url, out_path=None, use_ffmpeg=False):
+            calls.append(use_ffmpeg)
+            return 0
+
+        with mock.patch.object(amateurdoporn, 'full_download_from_page', full_download_from_page):
+            rc = main.main(['--use-ffmpeg', 'https://amateurdoporn.com/x/'])
+        self.assertEqual(rc, 0)
+        self.assertEqual(calls, [True])
+
+    def test_page_url_forwarded_to_fapnut(self):
+        calls = []
+
+        def download(m3u8_url, out_path=None, page_url=None, use_ffmpeg=False):
+            calls.append((out_path, page_url))
+            return 0
+
+        with mock.patch.object(fapnut, 'fetch_page', return_value='<iframe src="https://p/e">'), \
+                mock.patch.object(fapnut, 'extract_m3u8_from_html', return_value='https://cdn/index.m3u8'), \
+                mock.patch.object(fapnut, 'download', download):
+            rc = main.main(['https://fapnut.net/a-video/'])
+        self.assertEqual(rc, 0)
+        self.assertEqual(calls, [(None, 'https://fapnut.net/a-video/')])
+
+    def test_batch_out_paths_are_distinct(self):
+        self.assertEqual(
+            main._batch_out_paths([
+                'https://thotfans.com/post-one/',
+                'https://fapnut.net/post-one/',
+                'https://thothub.to/videos/1/post-one-2/',
+                'https://thothub.to/',
+                'https://thotfans.com/post two.mp4?x=1',
+            ]),
+            ['post-one.mp4', 'post-one-2.mp4', 'post-one-2-2.mp4', 'video.mp4', 'post-two.mp4'],
+        )
+
+    def test_batch_gives_each_page_its_own_file(self):
+        calls = []
+        lock = threading.Lock()
+
+        def download_url(url, site, out_path, use_ffmpeg):
+            with lock:
+                calls.append((url, out_path))
+            return 0
+
+        urls = ['https://fapnut.net/a/', 'https://amateurdoporn.com/x/a/', 'https://fapnut.net/a/']
+        with mock.patch.object(main._http, 'prewarm'), \
+                mock.patch.object(main, '_download_url', download_url):
+            rc = main.main(urls)
+        self.assertEqual(rc, 0)
+        self.assertEqual(
+            sorted(calls),
+            [('https://amateurdoporn.com/x/a/', 'a-2.mp4'), ('https://fapnut.net/a/', 'a.mp4')],
+        )
+
+    def test_prewarm_does_not_take_download_slots(self):
+        downloading = threading.Event()
+        warmed = threading.Event()
+        overlapped = []
+
+        def prewarm(session, url, timeout=5):
+            overlapped.append(downloading.wait(5))
+            warmed.set()
+
+        def download_url(url, site, out_path, use_ffmpeg):
+            downloading.set()
+            return 0
+
+        with mock.patch.object(main._http, 'prewarm', prewarm), \
+                mock.patch.object(main, '_download_url', download_url):
+            rc = main.main(['-j', '1', 'https://fapnut.net/a/', 'https://fapnut.net/b/'])
+        self.assertTrue(warmed.wait(5))
+        self.assertEqual(rc, 0)
+        self.assertEqual(overlapped, [True])
+
+
+if __name__ == '__main__':
+    unittest.main()
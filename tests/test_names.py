@@ -0,0 +1,23 @@
+import unittest
+
+from super_dl import _names, _url
+
+
+class UrlBasenameTest(unittest.TestCase):
+    def test_matches_parsed_path(self):
+        for url in (
+            'https://teenager365.to/get_file/3/abc/15000/15879/15879.mp4/?rnd=4361069126400',
+            'https://fapnut.net/some-video/',
+            'https://user@cdn.example.com:8443/a/b.mp4?x=1#frag',
+            'http://example.com',
+            'http://example.com/',
+            '//cdn.example.com/v.mp4',
+            '/relative/path?q',
+            'video.mp4',
+        ):
+            expected = _url.parse(url)[2].rstrip('/').rpartition('/')[2]
+            self.assertEqual(_names.url_basename(url), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
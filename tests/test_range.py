@@ -0,0 +1,110 @@
+import http.server
+import os
+import re
+import tempfile
+import threading
+import unittest
+
+import requests
+
+from super_dl import _range
+
+DATA = os.urandom(100_000)
+CHUNK = 4096
+
+
+class _RangeHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # '/ok' serves ranges, '/plain' has no Accept-Ranges, '/ignore' answers
+    # Range with 200, '/short' truncates parts and '/fail' errors on the first part
+    gets = 0
+
+    def _headers(self, code, length, extra=()):
+        self.send_response(code)
+        if self.path != '/plain':
+            self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(length))
+        for name, value in extra:
+            self.send_header(name, value)
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._headers(200, len(DATA))
+
+    def do_GET(self):
+        type(self).gets += 1
+        m = re.match(r'bytes=(\d+)-(\d+)', self.headers.get('Range', ''))
+        if not m or self.path in ('/plain', '/ignore'):
+            self._headers(200, len(DATA))
+            self.wfile.write(DATA)
+            return
+        lo, hi = int(m.group(1)), int(m.group(2))
+        if self.path == '/fail' and lo == 0:
+            self.send_error(500)
+            return
+        body = DATA[lo:hi + 1]
+        if self.path == '/short':
+            body = body[:-1]
+        self._headers(206, len(body), [('Content-Range', f'bytes {lo}-{hi}/{len(DATA)}')])
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ParallelDownloadTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _RangeHandler)
+        cls.base = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.out = os.path.join(tmp.name, 'out.mp4')
+        self.session = requests.Session()
+        self.addCleanup(self.session.close)
+        _RangeHandler.gets = 0
+
+    def _download(self, path, **kwargs):
+        kwargs.setdefault('chunk', CHUNK)
+        return _range.parallel_download(self.session, self.base + path, self.out, **kwargs)
+
+    def test_parts_written_at_their_offsets(self):
+        self.assertTrue(self._download('/ok'))
+        with open(self.out, 'rb') as fh:
+            self.assertEqual(fh.read(), DATA)
+
+    def test_no_range_support_falls_back(self):
+        self.assertFalse(self._download('/plain'))
+        self.assertFalse(os.path.exists(self.out))
+
+    def test_small_file_falls_back(self):
+        self.assertFalse(self._download('/ok', chunk=len(DATA)))
+        self.assertFalse(os.path.exists(self.out))
+
+    def test_ignored_range_removes_partial_file(self):
+        with self.assertRaises(RuntimeError):
+            self._download('/ignore')
+        self.assertFalse(os.path.exists(self.out))
+
+    def test_short_part_removes_partial_file(self):
+        with self.assertRaises(RuntimeError):
+            self._download('/short')
+        self.assertFalse(os.path.exists(self.out))
+
+    def test_failed_part_cancels_queued_parts(self):
+        with self.assertRaises(requests.HTTPError):
+            self._download('/fail', workers=1)
+        self.assertFalse(os.path.exists(self.out))
+        self.assertLess(_RangeHandler.gets, len(DATA) // CHUNK)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from super_dl.sites import simpthots
+
+
+class SimpthotsTest(unittest.TestCase):
+    def test_extract_mp4_prefers_og_video(self):
+        html = (
+            '<meta property="og:video:secure_url" content="https://cdn.example.com/secure.mp4" />'
+            '<meta property="og:video" content="https://cdn.example.com/plain.mp4" />'
+        )
+        self.assertEqual(simpthots.extract_mp4_url(html), 'https://cdn.example.com/plain.mp4')
+
+    def test_extract_mp4_secure_url(self):
+        html = '<meta content="https://cdn.example.com/secure.mp4" property="og:video:secure_url">'
+        self.assertEqual(simpthots.extract_mp4_url(html), 'https://cdn.example.com/secure.mp4')
+
+    def test_extract_mp4_unquoted_og_video(self):
+        html = '<meta property=og:video content=https://cdn.example.com/a.mp4?x=1&amp;y=2>'
+        self.assertEqual(simpthots.extract_mp4_url(html), 'https://cdn.example.com/a.mp4?x=1&y=2')
+
+    def test_extract_mp4_fallback(self):
+        html = '<script>var f = "https://cdn.example.com/x/y.mp4";</script>'
+        self.assertEqual(simpthots.extract_mp4_url(html), 'https://cdn.example.com/x/y.mp4')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,9 @@
+import http.server
+import io
+import os
+import re
+import tempfile
+import threading
 import unittest
 
 from super_dl.sites import thothub
@@ -21,11 +27,108 @@ class ThothubTest(unittest.TestCase):
         url = thothub.extract_mp4_url(html)
         self.assertEqual(url, 'https://cdn.example.com/videos/12345.mp4')
 
+    def test_extract_mp4_url_without_mp4(self):
+        self.assertIsNone(thothub.extract_mp4_url('<a href="https://cdn.example.com/videos/12345.webm">x</a>'))
+
+    def test_extract_mp4_url_fallback_after_quote(self):
+        html = '<a href="https://cdn.example.com/a.html">x</a> <a href="https://cdn.example.com/b.mp4">y</a>'
+        self.assertEqual(thothub.extract_mp4_url(html), 'https://cdn.example.com/b.mp4')
+
+    def test_extract_mp4_url_cached(self):
+        html = '<a href="https://cdn.example.com/videos/12345.mp4">download</a>'
+        thothub.extract_mp4_url_cached.cache_clear()
+        self.assertEqual(thothub.extract_mp4_url_cached(html), thothub.extract_mp4_url(html))
+        thothub.extract_mp4_url_cached(html)
+        self.assertEqual(thothub.extract_mp4_url_cached.cache_info().hits, 1)
+
+    def test_next_read_size_bounds(self):
+        self.assertEqual(thothub._next_read_size(1 << 16, 1e9), 1 << 17)
+        self.assertEqual(thothub._next_read_size(thothub.MAX_READ_SIZE, 1e9), thothub.MAX_READ_SIZE)
+        self.assertEqual(thothub._next_read_size(1 << 16, 1e3), 1 << 15)
+        self.assertEqual(thothub._next_read_size(thothub.MIN_READ_SIZE, 1e3), thothub.MIN_READ_SIZE)
+        self.assertEqual(thothub._next_read_size(1 << 16, 10 * (1 << 16)), 1 << 16)
+
     def test_filename_from_url_logic(self):
         url = 'https://teenager365.to/get_file/3/45b26c39d91fadc25ca70fe1c5912ccf52b9121dfa/15000/15879/15879.mp4/?rnd=4361069126400'
         name = thothub._filename_from_url(url)
         self.assertEqual(name, '15879.mp4')
 
+    def test_copy_overlapped_preserves_order(self):
+        data = os.urandom(thothub.CHUNK_SIZE * 9 + 123)
+        out = io.BytesIO()
+        thothub._copy_overlapped(io.BytesIO(data), out)
+        self.assertEqual(out.getvalue(), data)
+
+
+class _FileHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # '/ranged/...' advertises byte ranges, '/plain/...' does not and
+    # '/short/...' closes the connection halfway through the body
+    data = b''
+
+    def _send(self, code, body, extra=()):
+        self.send_response(code)
+        if self.path.startswith('/ranged/'):
+            self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in extra:
+            self.send_header(name, value)
+        self.end_headers()
+        return body
+
+    def do_HEAD(self):
+        self._send(200, self.data)
+
+    def do_GET(self):
+        m = re.match(r'bytes=(\d+)-(\d+)', self.headers.get('Range', ''))
+        if m and self.path.startswith('/ranged/'):
+            lo, hi = int(m.group(1)), int(m.group(2))
+            body = self._send(206, self.data[lo:hi + 1], [('Content-Range', f'bytes {lo}-{hi}/{len(self.data)}')])
+        else:
+            body = self._send(200, self.data)
+        if self.path.startswith('/short/'):
+            body = body[:len(body) // 2]
+            self.close_connection = True
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ThothubDownloadTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # large enough for the ranged path (two default chunks)
+        _FileHandler.data = os.urandom(17 << 20)
+        cls.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _FileHandler)
+        cls.base = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _check(self, path):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, 'sub', 'out.mp4')
+            self.assertEqual(thothub.download(self.base + path, out), 0)
+            with open(out, 'rb') as fh:
+                self.assertEqual(fh.read(), _FileHandler.data)
+
+    def test_ranged_download(self):
+        self._check('/ranged/15879.mp4')
+
+    def test_streamed_download(self):
+        self._check('/plain/15879.mp4')
+
+    def test_truncated_stream_removes_partial_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, 'out.mp4')
+            with self.assertRaises(Exception):
+                thothub.download(self.base + '/short/15879.mp4', out)
+            self.assertFalse(os.path.exists(out))
+
 
 if __name__ == '__main__':
     unittest.main()
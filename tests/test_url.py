@@ -0,0 +1,20 @@
+import unittest
+from urllib.parse import urlparse
+
+from super_dl import _url
+
+
+class ParseTest(unittest.TestCase):
+    def test_matches_urlparse(self):
+        for url in (
+            'https://user@cdn.example.com:8443/a/b.mp4?x=1&y=2#frag',
+            'https://fapnut.net/some-video/',
+            'http://example.com',
+            '/relative/path?q',
+        ):
+            p = urlparse(url)
+            self.assertEqual(_url.parse(url), (p.scheme, p.netloc, p.path, p.query, p.fragment))
+
+
+if __name__ == '__main__':
+    unittest.main()